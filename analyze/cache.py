@@ -0,0 +1,43 @@
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Optional
+
+CACHE_DIR = Path(
+    os.getenv("BBS_CACHE_DIR", Path.home() / ".cache" / "bbs_scraping")
+).expanduser()
+
+
+class JsonCache:
+    """
+    Persistent key -> JSON store in a single SQLite table.
+    The database is opened on first use, not at import time.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self.conn.execute(
+            "SELECT value FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+                (key, json.dumps(value)),
+            )
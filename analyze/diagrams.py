@@ -1,37 +1,57 @@
 import os
 import re
 import ast
+import pickle
 import logging
 import unicodedata
-from typing import Dict, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import matplotlib
 
 matplotlib.use("Agg")  # headless backend (no Tk needed)
 import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 import geopandas as gpd
-from pandas.api.types import is_scalar
+from pandas.api.types import is_integer_dtype, is_scalar
+
+from analyze.cache import CACHE_DIR
 
 logger = logging.getLogger(__name__)
 
+WORLD_URL = "https://raw.githubusercontent.com/datasets/geo-countries/master/data/countries.geojson"
+
 
 # ==================== Text Normalization ====================
+# Every code point unicodedata.combining() flags (nonzero combining class),
+# stripped after NFKD decomposition. All of them sit in the BMP and SMP.
+_COMBINING = [cp for cp in range(0x20000) if unicodedata.combining(chr(cp))]
+_COMBINING_RE = re.compile("[" + "".join(map(chr, _COMBINING)) + "]")
+_DIACRITIC_TABLE = dict.fromkeys(_COMBINING)
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_WS_RE = re.compile(r"\s+")
+
+
 def _normalize_text(s: str) -> str:
     if s is None:
         return ""
-    s = unicodedata.normalize("NFKD", str(s))
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = unicodedata.normalize("NFKD", str(s)).translate(_DIACRITIC_TABLE)
     s = s.lower().strip()
-    s = re.sub(r"[^\w\s]", " ", s)
-    s = re.sub(r"\s+", " ", s)
-    return s
+    s = _PUNCT_RE.sub(" ", s)
+    return _WS_RE.sub(" ", s)
 
 
 # ==================== World Geometry (no deprecated datasets) ====================
 def read_world_countries() -> gpd.GeoDataFrame:
-    url = "https://raw.githubusercontent.com/datasets/geo-countries/master/data/countries.geojson"
-    return gpd.read_file(url)
+    return gpd.read_file(WORLD_URL)
 
 
 def pick_country_name_column(world: gpd.GeoDataFrame) -> str:
@@ -44,37 +64,102 @@ def pick_country_name_column(world: gpd.GeoDataFrame) -> str:
     raise ValueError("Could not find a country name column in world dataset.")
 
 
+def _normalize_series(s: pd.Series) -> pd.Series:
+    """Vectorized `_normalize_text` for a Series of strings."""
+    return (
+        s.str.normalize("NFKD")
+        .str.replace(_COMBINING_RE, "", regex=True)
+        .str.lower()
+        .str.strip()
+        .str.replace(_PUNCT_RE, " ", regex=True)
+        .str.replace(_WS_RE, " ", regex=True)
+    )
+
+
 def build_country_lookup(world: gpd.GeoDataFrame) -> Dict[str, str]:
     name_col = pick_country_name_column(world)
     candidate_cols = [name_col] + [
         c for c in world.columns if c != name_col and world[c].dtype == object
     ]
 
-    lookup: Dict[str, str] = {}
-    for _, row in world[candidate_cols].iterrows():
-        canonical = str(row[name_col]).strip()
-        if not canonical:
-            continue
+    frame = pd.DataFrame(world[candidate_cols]).reset_index(drop=True)
+    frame["_canonical"] = frame[name_col].astype(str).str.strip()
+    frame = frame[frame["_canonical"] != ""]
+
+    # One row per (country, alias); stable sort restores row-major order so
+    # later countries still win on colliding keys, as with the old row loop.
+    long = frame.melt(
+        id_vars="_canonical",
+        value_vars=candidate_cols,
+        var_name="column",
+        value_name="name",
+        ignore_index=False,
+    )
+    long = long.sort_index(kind="stable").reset_index(drop=True)
+
+    long = long[long["name"].map(is_scalar)]
+    names = long["name"].astype(str).str.strip()
+    # The canonical name itself is always a key, even if it reads "nan"/"none".
+    keep = (names != "") & (
+        ~names.str.lower().isin({"nan", "none"}) | (long["column"] == name_col)
+    )
+    long = long[keep]
+
+    keys = _normalize_series(names[keep])
+    has_key = keys != ""
+    return dict(zip(keys[has_key], long.loc[has_key, "_canonical"]))
+
+
+# Bump whenever the cached columns or lookup keys change, so files written by
+# an older build are ignored instead of read with the wrong shape.
+_WORLD_CACHE_VERSION = 3
+
+
+def _cached_world() -> Tuple[gpd.GeoDataFrame, Dict[str, str]]:
+    """
+    Load the world geometry and country lookup from the on-disk cache,
+    downloading and building them only when the cache is missing or stale.
+    """
+    world_path = CACHE_DIR / f"countries.v{_WORLD_CACHE_VERSION}.gpkg"
+    lookup_path = CACHE_DIR / f"countries_lookup.v{_WORLD_CACHE_VERSION}.pkl"
+
+    if world_path.exists() and lookup_path.exists():
+        world = gpd.read_file(world_path, engine="pyogrio")
+        if "_join_name" in world.columns:
+            with lookup_path.open("rb") as f:
+                return world, pickle.load(f)
 
-        for c in candidate_cols:
-            val = row[c]
-            if not is_scalar(val):
-                continue
-            s = str(val).strip()
-            if not s or s.lower() in {"nan", "none"}:
-                continue
-            key = _normalize_text(s)
-            if key:
-                lookup[key] = canonical
+    logger.info("Downloading world countries to %s", CACHE_DIR)
+    world = read_world_countries()
+    # Aliases (ISO codes, alternative spellings) need the full attribute table;
+    # the map itself only needs the canonical name and a coarser outline.
+    country_lookup = build_country_lookup(world)
+    name_col = pick_country_name_column(world)
+    world = world[[name_col, "geometry"]].copy()
+    world["geometry"] = world.geometry.simplify(0.05, preserve_topology=True)
+    world["_join_name"] = world[name_col].astype(str).str.strip().str.casefold()
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Per-process temp names, so concurrent crawls never write the same file.
+    tmp_path = world_path.with_name(f"{world_path.name}.{os.getpid()}.tmp")
+    world.to_file(tmp_path, driver="GPKG", engine="pyogrio")
+    os.replace(tmp_path, world_path)
+
+    tmp_path = lookup_path.with_name(f"{lookup_path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("wb") as f:
+        pickle.dump(country_lookup, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, lookup_path)
 
-        key_canon = _normalize_text(canonical)
-        if key_canon:
-            lookup[key_canon] = canonical
+    return world, country_lookup
 
-    return lookup
 
+@lru_cache(maxsize=1)
+def get_world_and_lookup() -> Tuple[gpd.GeoDataFrame, Dict[str, str]]:
+    """Process-wide memo over `_cached_world()`; callers must not mutate the results."""
+    return _cached_world()
 
-# ==================== CSV Loading ====================
+
+# ==================== Jobs Loading ====================
 def _parse_skills_cell(x) -> str:
     """
     Accepts:
@@ -98,19 +183,106 @@ def _parse_skills_cell(x) -> str:
     return ""
 
 
+# A list repr whose items are plain single-quoted strings, e.g. "['Python', 'SQL']".
+# Dropping the brackets and quotes from those gives exactly what
+# ast.literal_eval + ", ".join would, so they skip the per-row parse.
+_SIMPLE_LIST_REPR = r"\[(?:'[^'\\]*'(?:, '[^'\\]*')*)?\]"
+
+
+def _parse_skills_column(skills: pd.Series) -> pd.Series:
+    """
+    Vectorized `_parse_skills_cell` over a whole column. Only lists and list
+    reprs that are not simple (escapes, double quotes) go through Python.
+    """
+    out = pd.Series("", index=skills.index, dtype=object)
+    kind = skills.map(type)
+
+    text = skills[kind == str].astype(str).str.strip()
+    out[text.index] = text
+
+    simple = text.str.fullmatch(_SIMPLE_LIST_REPR).astype(bool)
+    out[text.index[simple]] = (
+        text[simple].str.slice(1, -1).str.replace("'", "", regex=False)
+    )
+
+    residual = pd.concat(
+        [
+            skills[kind == list],
+            text[~simple & text.str.startswith("[") & text.str.endswith("]")],
+        ]
+    )
+    if not residual.empty:
+        out[residual.index] = residual.map(_parse_skills_cell)
+    return out
+
+
+JOB_COLUMNS = ["skills", "years_of_experience", "location"]
+
+
+def _years_column(years: pd.Series) -> pd.Series:
+    """Coerce `years_of_experience` to nullable int64[pyarrow]; unparsable -> <NA>."""
+    if not is_integer_dtype(years.dtype):
+        years = pd.to_numeric(years.astype(object), errors="coerce")
+        years = np.trunc(years).astype("float64[pyarrow]")
+    return years.astype("int64[pyarrow]")
+
+
+def _prepare_jobs(df: pd.DataFrame) -> pd.DataFrame:
+    df["skills"] = _parse_skills_column(df["skills"])
+    df["years_of_experience"] = _years_column(df["years_of_experience"])
+    df["location"] = df["location"].astype("string[pyarrow]").fillna("")
+    return df
+
+
 def load_jobs_csv(csv_path: str) -> pd.DataFrame:
-    df = pd.read_csv(csv_path)
-    expected = {"skills", "years_of_experience", "location"}
-    missing = expected - set(df.columns)
+    header = pd.read_csv(csv_path, nrows=0).columns
+    missing = set(JOB_COLUMNS) - set(header)
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
 
-    df["skills"] = df["skills"].apply(_parse_skills_cell).fillna("")
-    df["location"] = df["location"].fillna("").astype(str)
-    return df
+    df = pd.read_csv(
+        csv_path, engine="pyarrow", dtype_backend="pyarrow", usecols=JOB_COLUMNS
+    )
+    return _prepare_jobs(df)
+
+
+def load_jobs_parquet(parquet_path: str) -> pd.DataFrame:
+    missing = set(JOB_COLUMNS) - set(pq.read_schema(parquet_path).names)
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+    table = pq.read_table(parquet_path, columns=JOB_COLUMNS)
+    skills = table["skills"]
+    if pa.types.is_list(skills.type):
+        # Join list<string> cells in Arrow so pandas only ever sees strings.
+        table = table.set_column(
+            table.schema.get_field_index("skills"),
+            "skills",
+            pc.binary_join(skills, ", "),
+        )
+    return _prepare_jobs(table.to_pandas(types_mapper=pd.ArrowDtype))
+
+
+def load_jobs(path: str) -> pd.DataFrame:
+    if str(path).endswith(".parquet"):
+        return load_jobs_parquet(path)
+    return load_jobs_csv(path)
 
 
 # ==================== Country Inference ====================
+# USPS codes of the 50 states plus DC, as LinkedIn writes them ("Austin, TX").
+US_STATES = frozenset(
+    {
+        "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA",
+        "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD", "MA",
+        "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY",
+        "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX",
+        "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+    }
+)  # fmt: skip
+_US_KEY = _normalize_text("United States")
+
+
 def infer_country_from_location(
     location: str, country_lookup: Dict[str, str], *, allow_us_state_guess: bool = False
 ) -> Optional[str]:
@@ -121,144 +293,160 @@ def infer_country_from_location(
     if full_key in country_lookup:
         return country_lookup[full_key]
 
-    tokens = [t.strip() for t in str(location).split(",") if t.strip()]
+    tokens = [t.strip() for t in str(location).split(",")]
     for token in reversed(tokens):
+        if not token:
+            continue
         key = _normalize_text(token)
         if key in country_lookup:
             return country_lookup[key]
-        if allow_us_state_guess and re.fullmatch(r"[A-Z]{2}", token):
-            us_key = _normalize_text("United States")
-            return country_lookup.get(us_key, "United States")
+        if allow_us_state_guess and token in US_STATES:
+            return country_lookup.get(_US_KEY, "United States")
 
     return None
 
 
 # ==================== Plots ====================
+def _canvas(figsize: Tuple[float, float]) -> Tuple[Figure, Axes]:
+    """
+    Return a new figure with one Axes. Built with Figure() rather than
+    plt.figure(), so pyplot's global state is never touched: nothing needs
+    closing and charts can render on separate threads.
+    """
+    fig = Figure(figsize=figsize)
+    return fig, fig.add_subplot()
+
+
 def plot_top_skills(df: pd.DataFrame, out_path: str, top_n: int = 10) -> str:
-    all_skills = (
-        df["skills"]
-        .str.split(",")
-        .explode()
-        .astype(str)
-        .str.strip()
-        .replace("", pd.NA)
-        .dropna()
-    )
-    top_skills = all_skills.value_counts().head(top_n)
-    if top_skills.empty:
+    counts: Counter = Counter()
+    for cell in df["skills"].values:
+        if cell:
+            counts.update(s for s in map(str.strip, cell.split(",")) if s)
+    top_skills = counts.most_common(top_n)
+    if not top_skills:
         raise ValueError("No skills found to plot.")
 
-    plt.figure(figsize=(10, 6))
-    top_skills.plot(kind="bar")
-    plt.title(f"Top {top_n} Most In-Demand Skills")
-    plt.xlabel("Skill")
-    plt.ylabel("Number of Job Listings")
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=150)
-    plt.close()
+    fig, ax = _canvas((10, 6))
+    ax.bar(*zip(*top_skills))
+    ax.set_title(f"Top {top_n} Most In-Demand Skills")
+    ax.set_xlabel("Skill")
+    ax.set_ylabel("Number of Job Listings")
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=150)
     return out_path
 
 
 def plot_experience_levels(df: pd.DataFrame, out_path: str) -> str:
-    exp = pd.to_numeric(df["years_of_experience"], errors="coerce").dropna().astype(int)
-    exp_counts = exp.value_counts().sort_index()
-    if exp_counts.empty:
+    exp = df["years_of_experience"].dropna().to_numpy(dtype=np.int64)
+    # Sort/unique on int16 when it's lossless; a stray 40000 must not wrap.
+    i16 = np.iinfo(np.int16)
+    if exp.size and i16.min <= exp.min() and exp.max() <= i16.max:
+        exp = exp.astype(np.int16)
+    years, counts = np.unique(exp, return_counts=True)
+    if not years.size:
         raise ValueError("No parsable 'years_of_experience' values to plot.")
 
-    plt.figure(figsize=(8, 6))
-    exp_counts.plot(kind="bar")
-    plt.title("Years of Experience Required")
-    plt.xlabel("Years")
-    plt.ylabel("Number of Job Listings")
-    plt.xticks(rotation=0)
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=150)
-    plt.close()
+    fig, ax = _canvas((8, 6))
+    ax.bar(years.astype(str), counts)
+    ax.set_title("Years of Experience Required")
+    ax.set_xlabel("Years")
+    ax.set_ylabel("Number of Job Listings")
+    ax.tick_params(axis="x", labelrotation=0)
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=150)
     return out_path
 
 
 def plot_country_heatmap(
     df: pd.DataFrame, out_path: str, *, allow_us_state_guess: bool = False
 ) -> str:
-    world = read_world_countries()
-    country_lookup = build_country_lookup(world)
-    name_col = pick_country_name_column(world)
+    world, country_lookup = get_world_and_lookup()
 
-    countries = df["location"].apply(
-        lambda loc: infer_country_from_location(
+    # Listings repeat the same few locations; resolve each distinct one once.
+    resolved = {
+        loc: infer_country_from_location(
             loc, country_lookup, allow_us_state_guess=allow_us_state_guess
         )
-    )
+        for loc in df["location"].unique()
+    }
+    countries = df["location"].map(resolved)
     df_countries = countries.dropna()
     if df_countries.empty:
         raise ValueError("No resolvable countries from 'location' values to plot.")
 
-    country_counts = df_countries.value_counts()
-
-    world["_join_name"] = world[name_col].astype(str).str.strip().str.lower()
-    cc = country_counts.rename_axis("country").reset_index(name="job_count")
-    cc["_join_name"] = cc["country"].str.strip().str.lower()
+    counts = (
+        pd.DataFrame({"_join_name": df_countries.str.strip().str.casefold()})
+        .groupby("_join_name", sort=False)
+        .size()
+        .rename("job_count")
+        .reset_index()
+    )
 
-    world = world.merge(cc[["_join_name", "job_count"]], on="_join_name", how="left")
+    world = world.merge(counts, on="_join_name", how="left")
 
-    ax = world.plot(
+    fig, ax = _canvas((12, 8))
+    world.plot(
+        ax=ax,
         column="job_count",
         cmap="OrRd",
         legend=True,
-        figsize=(12, 8),
         missing_kwds={"color": "lightgrey", "label": "No data"},
         linewidth=0.2,
         edgecolor="black",
     )
     ax.set_axis_off()
     ax.set_title("Job Listings by Country", pad=12)
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=150, bbox_inches="tight")
-    plt.close()
+    # Explicit layout instead of bbox_inches="tight", which renders twice.
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=150)
     return out_path
 
 
 # ==================== Orchestrator ====================
 def make_all_charts(
-    csv_path: str, out_dir: str, *, allow_us_state_guess: bool = False
+    jobs_path: str, out_dir: str, *, allow_us_state_guess: bool = False
 ) -> None:
     """
     Save all outputs directly in out_dir (no subfolders).
+    jobs_path may be the spider's Parquet export or a CSV.
     """
     os.makedirs(out_dir, exist_ok=True)
-    df = load_jobs_csv(csv_path)
-
-    logger.info("→ Building Top Skills…")
-    logger.info(
-        "   saved: %s", plot_top_skills(df, os.path.join(out_dir, "top_skills.png"))
-    )
-
-    logger.info("→ Building Experience Levels…")
-    logger.info(
-        "   saved: %s",
-        plot_experience_levels(df, os.path.join(out_dir, "experience_levels.png")),
-    )
-
-    logger.info("→ Building Country Heatmap…")
-    logger.info(
-        "   saved: %s",
-        plot_country_heatmap(
+    df = load_jobs(jobs_path)
+
+    # Charts are independent standalone Figures, so they render side by side
+    # on threads. Not processes: spawned workers re-import the caller's
+    # __main__ (re-running an unguarded CrawlerProcess script) and re-import
+    # pandas/geopandas/matplotlib just to draw a small chart.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        logger.info("→ Building Top Skills…")
+        top_skills = pool.submit(
+            plot_top_skills, df, os.path.join(out_dir, "top_skills.png")
+        )
+        logger.info("→ Building Experience Levels…")
+        experience = pool.submit(
+            plot_experience_levels, df, os.path.join(out_dir, "experience_levels.png")
+        )
+        logger.info("→ Building Country Heatmap…")
+        heatmap = pool.submit(
+            plot_country_heatmap,
             df,
             os.path.join(out_dir, "location_heatmap.png"),
             allow_us_state_guess=allow_us_state_guess,
-        ),
-    )
+        )
+
+        for future in (top_skills, experience, heatmap):
+            logger.info("   saved: %s", future.result())
 
 
 if __name__ == "__main__":
-    # Standalone run: show logs in console
+    # Standalone run from the repo root: python -m analyze.diagrams
     logging.basicConfig(
         level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
     )
-    # Example: put results in data/Developer/2025-08-07/
+    # Example: put results in data/vibe_coder/2025-08-07/
     make_all_charts(
-        "../data/vibe_coder/2025-08-07/jobs.csv",
-        out_dir="../data/vibe_coder/2025-08-07",
+        "data/vibe_coder/2025-08-07/jobs.csv",
+        out_dir="data/vibe_coder/2025-08-07",
         allow_us_state_guess=False,
     )
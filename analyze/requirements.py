@@ -1,8 +1,12 @@
 import asyncio
+import hashlib
 import os
+import re
 import json
 from dotenv import load_dotenv
 
+from analyze.cache import CACHE_DIR, JsonCache
+
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -12,6 +16,19 @@ from openai import AsyncOpenAI
 
 client = AsyncOpenAI(api_key=OPENAI_API_KEY)
 
+_EXPERIENCE_RE = re.compile(r"\bexperience\b", re.IGNORECASE)
+
+# Caps concurrent API calls across all callers, so a burst of detail pages
+# queues here instead of turning into a wave of 429s.
+_SEM = asyncio.Semaphore(int(os.getenv("EXTRACT_CONCURRENCY", "8")))
+
+# Extractions keyed by a hash of the description, so re-scraped listings are free.
+_cache = JsonCache(CACHE_DIR / "gpt.sqlite")
+
+# Extractions currently running, by the same key, so identical descriptions
+# arriving together share one API call instead of racing past the cache.
+_inflight: dict[str, asyncio.Task] = {}
+
 functions = [
     {
         "name": "extract_job_requirements",
@@ -37,36 +54,71 @@ functions = [
 
 async def extract(job_text: str):
     """ChatGTP writes a function for ChatGPT"""
-    resp = await client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a JSON extractor.  Given a LinkedIn job description, "
-                    "return ONLY JSON with keys: required_skills (string array), "
-                    "years_experience (integer).  "
-                    "If it mentions X years of experience use X; "
-                    "if it says 'experience' but gives no number, return 1; "
-                    "if no experience requirement at all, return 0.  "
-                    "Strip any leading or trailing whitespace from each skill name before adding it to required_skills."
-                ),
-            },
-            {"role": "user", "content": job_text},
-        ],
-        functions=functions,
-        function_call={"name": "extract_job_requirements"},
-    )
+    key = hashlib.blake2b(job_text.encode(), digest_size=16).hexdigest()
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch(job_text, key))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so one cancelled caller doesn't cancel the call for the others.
+    return await asyncio.shield(task)
+
+
+async def _fetch(job_text: str, key: str):
+    async with _SEM:
+        resp = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "You are a JSON extractor.  Given a LinkedIn job description, "
+                        "return ONLY JSON with keys: required_skills (string array), "
+                        "years_experience (integer).  "
+                        "If it mentions X years of experience use X; "
+                        "if it says 'experience' but gives no number, return 1; "
+                        "if no experience requirement at all, return 0.  "
+                        "Strip any leading or trailing whitespace from each skill name before adding it to required_skills."
+                    ),
+                },
+                {"role": "user", "content": job_text},
+            ],
+            functions=functions,
+            function_call={"name": "extract_job_requirements"},
+        )
 
     # Pull out the function_call and parse its JSON arguments
     fn_call = resp.choices[0].message.function_call
     args = json.loads(fn_call.arguments)
 
     # Post‐processing: if GPT gave 0 but there's an 'experience' mention, bump to 1
+    if not args.get("years_experience") and _EXPERIENCE_RE.search(job_text):
+        args["years_experience"] = 1
+
+    _cache.set(key, args)
     return args
 
 
+async def extract_batch(
+    job_texts: list[str], *, return_exceptions: bool = False
+) -> list[dict]:
+    """
+    Run `extract` over many descriptions concurrently; `_SEM` bounds the
+    API calls in flight. Results come back in input order; with
+    `return_exceptions`, a failed extraction is returned in its slot
+    instead of raised.
+    """
+    return await asyncio.gather(
+        *(extract(t) for t in job_texts), return_exceptions=return_exceptions
+    )
+
+
 if __name__ == "__main__":
+    # Standalone run from the repo root: python -m analyze.requirements
     job_desc = """
     About the job
     As a member of the Development Team,
@@ -0,0 +1,113 @@
+# Define here your custom feed exporters
+#
+# See documentation in:
+# https://docs.scrapy.org/en/latest/topics/exporters.html
+
+import os
+
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scrapy.exporters import BaseItemExporter
+
+# Column types for JobItem's exported fields.
+JOB_SCHEMA = pa.schema(
+    [
+        ("title", pa.string()),
+        ("company_name", pa.string()),
+        ("location", pa.string()),
+        ("listed_date", pa.string()),
+        ("detail_link", pa.string()),
+        ("skills", pa.list_(pa.string())),
+        ("years_of_experience", pa.int64()),
+    ]
+)
+
+
+class ParquetItemExporter(BaseItemExporter):
+    """
+    Stream items into a zstd-compressed Parquet file, `batch_size` rows per
+    RecordBatch, so the analytics can read typed columns straight back.
+    """
+
+    def __init__(self, file, *, batch_size: int = 1024, **kwargs):
+        super().__init__(dont_fail=True, **kwargs)
+        self.file = file
+        self.batch_size = batch_size
+        self._rows: list[dict] = []
+        self._writer: pq.ParquetWriter | None = None
+
+    def start_exporting(self):
+        self._writer = pq.ParquetWriter(self.file, JOB_SCHEMA, compression="zstd")
+
+    def export_item(self, item):
+        row = dict(self._get_serialized_fields(item, default_value=None))
+        # Coerce up front so a bad value fails this item alone instead of the
+        # whole buffered batch in _flush().
+        self._rows.append(_coerce_row(row))
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def finish_exporting(self):
+        try:
+            self._flush()
+        finally:
+            self._writer.close()
+        # Make the file durable before feed_exporter_closed fires, so the
+        # analytics hook can read it straight away.
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def _flush(self):
+        rows, self._rows = self._rows, []
+        if rows:
+            batch = pa.RecordBatch.from_pylist(rows, schema=JOB_SCHEMA)
+            self._writer.write_batch(batch)
+
+
+def _coerce_row(row: dict) -> dict:
+    """
+    Cast `row` to JOB_SCHEMA's Python types, e.g. years "3" -> 3 and a bare
+    skill string -> [skill]. Raises ValueError/TypeError for values that
+    can't be cast.
+    """
+    for field in JOB_SCHEMA:
+        value = row.get(field.name)
+        if value is None:
+            continue
+        if pa.types.is_list(field.type):
+            if isinstance(value, str):
+                value = [value]
+            row[field.name] = [str(v) for v in value if v is not None]
+        elif pa.types.is_integer(field.type):
+            row[field.name] = int(value)
+        else:
+            row[field.name] = str(value)
+    return row
+
+
+class OrjsonLinesExporter(BaseItemExporter):
+    """
+    JSON-lines exporter that encodes each item with a single orjson call and
+    writes the bytes straight to the feed file. Registered as the "orjsonl"
+    feed format, e.g. `-o jobs.jsonl:orjsonl`.
+
+    orjson only emits UTF-8, so any other FEED_EXPORT_ENCODING is rejected;
+    `indent` is ignored, as by Scrapy's own jsonlines exporter.
+    """
+
+    def __init__(self, file, **kwargs):
+        super().__init__(**kwargs)
+        if self.encoding and self.encoding.replace("-", "").lower() != "utf8":
+            raise ValueError(
+                f"OrjsonLinesExporter writes UTF-8 only, not {self.encoding!r}"
+            )
+        self.file = file
+
+    def export_item(self, item):
+        self.file.write(
+            orjson.dumps(
+                dict(self._get_serialized_fields(item)),
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+        )
@@ -0,0 +1,83 @@
+# Define here your custom extensions
+#
+# See documentation in:
+# https://docs.scrapy.org/en/latest/topics/extensions.html
+
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Optional
+
+from scrapy import signals
+from scrapy.extensions.httpcache import DummyPolicy
+
+
+class QueueLogging:
+    """
+    Move Scrapy's log output (stream/file handlers on the root logger) behind
+    a QueueHandler while the engine runs. The message itself (`msg % args`,
+    exception text) is still rendered on the reactor by QueueHandler.prepare();
+    the LOG_FORMAT pass and the write() calls happen on a background
+    QueueListener thread.
+    """
+
+    def __init__(self):
+        self.listener: Optional[QueueListener] = None
+        self.queue_handler: Optional[QueueHandler] = None
+        self.handlers: list[logging.Handler] = []
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        ext = cls()
+        crawler.signals.connect(ext.engine_started, signal=signals.engine_started)
+        crawler.signals.connect(ext.engine_stopped, signal=signals.engine_stopped)
+        return ext
+
+    def engine_started(self):
+        root = logging.getLogger()
+        # Stats counters (LogCounterHandler) stay on the root logger.
+        self.handlers = [
+            h for h in root.handlers if isinstance(h, logging.StreamHandler)
+        ]
+        if not self.handlers:
+            return
+
+        queue = SimpleQueue()
+        self.queue_handler = QueueHandler(queue)
+        # Scrapy leaves the root logger at NOTSET and applies LOG_LEVEL on its
+        # handler; without the same floor here every DEBUG record would be
+        # formatted by prepare() on the reactor only to be dropped later.
+        self.queue_handler.setLevel(min(h.level for h in self.handlers))
+        for handler in self.handlers:
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+
+        self.listener = QueueListener(queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def engine_stopped(self):
+        if self.listener is None:
+            return
+
+        root = logging.getLogger()
+        root.removeHandler(self.queue_handler)
+        self.listener.stop()  # drains whatever is still queued
+        for handler in self.handlers:
+            root.addHandler(handler)
+        self.listener = None
+
+
+class NoBanCachePolicy(DummyPolicy):
+    """
+    DummyPolicy that only stores non-empty 2xx/3xx responses. The cache
+    middleware sees responses before the rotating-proxies ban detection, so
+    a 403/999 ban page or an empty 200 would otherwise be replayed to every
+    proxy retry of that URL until the cache entry expires.
+    """
+
+    def should_cache_response(self, response, request):
+        return (
+            200 <= response.status < 400
+            and bool(response.body)
+            and super().should_cache_response(response, request)
+        )
@@ -3,15 +3,23 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/items.html
 
-import scrapy
+from dataclasses import dataclass, field, fields
+from typing import Optional
 
 
-class JobItem(scrapy.Item):
-    title = scrapy.Field()
-    company_name = scrapy.Field()
-    location = scrapy.Field()
-    listed_date = scrapy.Field()
+@dataclass(slots=True)
+class JobItem:
+    title: str = ""
+    company_name: str = ""
+    location: str = ""
+    listed_date: str = ""
 
-    detail_link = scrapy.Field()
-    skills = scrapy.Field()
-    years_of_experience = scrapy.Field()
+    detail_link: str = ""
+    skills: list[str] = field(default_factory=list)
+    years_of_experience: Optional[int] = None
+
+    # Raw description, consumed by SkillBatchPipeline; never exported.
+    description: str = field(default="", repr=False, metadata={"export": False})
+
+
+EXPORT_FIELDS = [f.name for f in fields(JobItem) if f.metadata.get("export", True)]
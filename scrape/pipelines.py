@@ -3,11 +3,87 @@
 # Don't forget to add your pipeline to the ITEM_PIPELINES setting
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
+import asyncio
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 
+from analyze.requirements import extract_batch
+
 
 class ScrapePipeline:
     def process_item(self, item, spider):
         return item
+
+
+class SkillBatchPipeline:
+    """
+    Fill `skills` / `years_of_experience` from each item's description,
+    extracting in batches instead of one call per item.
+
+    Items wait until EXTRACT_BATCH_SIZE descriptions are buffered or
+    EXTRACT_BATCH_WAIT seconds have passed since the first one arrived.
+    That timer is what flushes the last partial batch of a crawl; Scrapy
+    only closes the spider once every in-flight item has come back.
+    """
+
+    def __init__(self, batch_size: int, max_wait: float):
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._buf: list[tuple[object, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            batch_size=crawler.settings.getint("EXTRACT_BATCH_SIZE", 25),
+            max_wait=crawler.settings.getfloat("EXTRACT_BATCH_WAIT", 2.0),
+        )
+
+    async def process_item(self, item, spider):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._buf.append((item, future))
+        if len(self._buf) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        requirements = await future
+        adapter = ItemAdapter(item)
+        adapter["skills"] = requirements.get("required_skills", [])
+        adapter["years_of_experience"] = requirements.get("years_experience", 0)
+        adapter["description"] = ""
+        spider.logger.info("Returning required skills (%r)", requirements)
+        return item
+
+    def close_spider(self, spider):
+        # Nothing is buffered by now (see class docstring); just drop the timer.
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._buf = self._buf, []
+        if batch:
+            task = asyncio.ensure_future(self._resolve(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _resolve(batch):
+        items, futures = zip(*batch)
+        descriptions = [ItemAdapter(item)["description"] for item in items]
+        results = await extract_batch(descriptions, return_exceptions=True)
+        # A failed extraction fails only its own item, as before batching.
+        for future, result in zip(futures, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
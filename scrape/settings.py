@@ -44,18 +44,29 @@ DOWNLOADER_MIDDLEWARES = {
 }
 
 # Logging settings
+# Only warnings and errors by default; pass `-L INFO` to a crawl to debug it.
 LOG_ENABLED = True
-LOG_LEVEL = "INFO"
+LOG_LEVEL = "WARNING"
 
 # Disable Scrapy's default logging format
 LOG_FORMAT = "[%(levelname)8s]: %(message)s"
-LOG_FILE = "parser.log"
 
 # Concurrency and throttling settings
-CONCURRENT_REQUESTS = 4
-DOWNLOAD_DELAY = 2  # seconds between requests
-CONCURRENT_REQUESTS_PER_DOMAIN = 2
+# Every request goes to linkedin.com but leaves through a rotating proxy, so
+# the per-domain cap is the effective one and can match the global cap.
+# AutoThrottle only adjusts the delay from response latency (a fast 429 never
+# raises it). 429s and ban pages are handled by RetryMiddleware and
+# rotating-proxies' BanDetectionMiddleware, which retry through another proxy
+# and back the offending proxy off.
+CONCURRENT_REQUESTS = 32
+CONCURRENT_REQUESTS_PER_DOMAIN = 32
+DOWNLOAD_DELAY = 0
 AUTOTHROTTLE_ENABLED = True
+AUTOTHROTTLE_START_DELAY = 0.5
+AUTOTHROTTLE_MAX_DELAY = 10
+AUTOTHROTTLE_TARGET_CONCURRENCY = 16.0
+REACTOR_THREADPOOL_MAXSIZE = 20
+DNSCACHE_ENABLED = True
 
 # Disable cookies (enabled by default)
 # COOKIES_ENABLED = False
@@ -83,36 +94,47 @@ AUTOTHROTTLE_ENABLED = True
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
-# EXTENSIONS = {
-#    "scrapy.extensions.telnet.TelnetConsole": None,
-# }
+EXTENSIONS = {
+    "scrape.extensions.QueueLogging": 0,
+}
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-# ITEM_PIPELINES = {
-#    "scrape.pipelines.ScrapePipeline": 300,
-# }
+ITEM_PIPELINES = {
+    "scrape.pipelines.SkillBatchPipeline": 300,
+}
+
+# Skill extraction batching (SkillBatchPipeline)
+EXTRACT_BATCH_SIZE = 25
+EXTRACT_BATCH_WAIT = 2.0  # seconds before a partial batch is sent anyway
 
-# Enable and configure the AutoThrottle extension (disabled by default)
+# AutoThrottle is configured above with the concurrency settings
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
-# AUTOTHROTTLE_ENABLED = True
-# The initial download delay
-# AUTOTHROTTLE_START_DELAY = 5
-# The maximum download delay to be set in case of high latencies
-# AUTOTHROTTLE_MAX_DELAY = 60
-# The average number of requests Scrapy should be sending in parallel to
-# each remote server
-# AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
 # Enable showing throttling stats for every response received:
 # AUTOTHROTTLE_DEBUG = False
 
-# Enable and configure HTTP caching (disabled by default)
+# HTTP caching: re-runs within a day replay pages instead of refetching them
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
-# HTTPCACHE_ENABLED = True
-# HTTPCACHE_EXPIRATION_SECS = 0
-# HTTPCACHE_DIR = "httpcache"
-# HTTPCACHE_IGNORE_HTTP_CODES = []
-# HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+HTTPCACHE_ENABLED = True
+HTTPCACHE_EXPIRATION_SECS = 86400
+HTTPCACHE_DIR = ".httpcache"
+HTTPCACHE_IGNORE_HTTP_CODES = [403, 408, 429, 500, 502, 503, 504, 999]
+HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+# Cache regardless of response headers (RFC2616Policy would honour no-cache),
+# but never ban pages or empty bodies, which proxy retries must refetch
+HTTPCACHE_POLICY = "scrape.extensions.NoBanCachePolicy"
+HTTPCACHE_GZIP = True
+
+# Ask for compressed responses (HttpCompressionMiddleware, on by default)
+COMPRESSION_ENABLED = True
+
+# Custom feed formats
+FEED_EXPORTERS = {
+    "parquet": "scrape.exporters.ParquetItemExporter",
+    "orjsonl": "scrape.exporters.OrjsonLinesExporter",
+}
 
 # Set settings whose default value is deprecated to a future-proof value
+# (SkillBatchPipeline needs the asyncio reactor, so pin it explicitly.)
+TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
 FEED_EXPORT_ENCODING = "utf-8"
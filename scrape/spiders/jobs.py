@@ -1,34 +1,49 @@
 import logging
-import time
 from datetime import date
 from pathlib import Path
 from urllib.parse import quote_plus
 
 import scrapy
+from parsel.csstranslator import css2xpath
 from scrapy import signals
 from scrapy.http import Response
+from twisted.internet.threads import deferToThread
 
-from scrape.items import JobItem
-from analyze.requirements import extract
+from scrape.items import EXPORT_FIELDS, JobItem
 from analyze.diagrams import make_all_charts
 
-# catch only parsing empties to retry specifically
-try:
-    from pandas.errors import EmptyDataError, ParserError
-except Exception:  # pandas might not be importable here in some envs; be safe
-    EmptyDataError = ParserError = Exception
+# CSS selectors translated to XPath once at import, not per job element.
+_XP_JOBS = css2xpath("li")
+_XP_DETAIL_LINK = css2xpath(".base-card__full-link::attr(href)")
+_XP_TITLE = css2xpath("h3::text")
+_XP_COMPANY = css2xpath("h4 a::text")
+_XP_LOCATION = css2xpath(".job-search-card__location::text")
+_XP_LISTED_DATE = css2xpath("time::attr(datetime)")
+_XP_DESC = css2xpath("div.show-more-less-html__markup")
 
 
 class JobsSpider(scrapy.Spider):
     name = "jobs"
     handle_httpstatus_list = [400]
     tpr = "r86400"
-    start_url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?"
+    page_size = 25  # listings per seeMoreJobPostings page
+    prefetch_pages = 4  # listing pages kept in flight at once
+    start_url = (
+        "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?"
+    )
 
     def __init__(self, role="Developer", location=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.role = role
         self.location = location
+        # Query parts never change during a crawl; encode them once.
+        self._role_q = quote_plus(role)
+        self._loc_q = f"&location={quote_plus(location)}" if location else ""
+        self.prefetch_pages = int(self.prefetch_pages)
+        self._stopped = False  # set once any page comes back empty
+        # Detail URLs (query stripped) already followed; overlapping listing
+        # pages repeat jobs with fresh tracking params the dupefilter misses.
+        self._seen: set[str] = set()
         self.run_dir: Path | None = None
         self.output_file: Path | None = None
 
@@ -43,125 +58,127 @@ class JobsSpider(scrapy.Spider):
         run_dir.mkdir(parents=True, exist_ok=True)
 
         spider.run_dir = run_dir
-        spider.output_file = run_dir / "jobs.csv"
-
-        # Export items into data/<role>/<date>/jobs.csv
-        crawler.settings.set(
-            "FEEDS",
-            {
-                str(spider.output_file): {
-                    "format": "csv",
-                    "encoding": "utf-8",
-                    "overwrite": True,
-                }
-            },
-            priority="cmdline",
-        )
+        spider.output_file = run_dir / "jobs.parquet"
+
+        # Export items into data/<role>/<date>/jobs.parquet, keeping any
+        # feeds passed with -o/-O alongside it.
+        feeds = crawler.settings.getdict("FEEDS")
+        feeds[str(spider.output_file)] = {
+            "format": "parquet",
+            "overwrite": True,
+            "fields": EXPORT_FIELDS,
+        }
+        crawler.settings.set("FEEDS", feeds, priority="cmdline")
 
         # Run analytics AFTER feed export finishes.
-        feed_signal = (
-            getattr(signals, "feedexporter_closed", None) or signals.engine_stopped
+        crawler.signals.connect(
+            spider.on_feeds_ready, signal=signals.feed_exporter_closed
         )
-        crawler.signals.connect(spider.on_feeds_ready, signal=feed_signal)
 
         return spider
 
     def build_url(self, start: int) -> str:
-        role_query = quote_plus(self.role)
-        url = f"{self.start_url}keywords={role_query}&f_TPR={self.tpr}&start={start}"
-        if self.location:
-            location_query = quote_plus(self.location)
-            url += f"&location={location_query}"
-        return url
+        return (
+            f"{self.start_url}keywords={self._role_q}"
+            f"&f_TPR={self.tpr}&start={start}{self._loc_q}"
+        )
 
     async def start(self):
-        self.logger.info(f"Spider started (role={self.role}, location={self.location})")
-        url = self.build_url(start=0)
-        yield scrapy.Request(url=url, callback=self.parse, cb_kwargs={"start": 0})
+        self.logger.info(
+            "Spider started (role=%s, location=%s)", self.role, self.location
+        )
+        for page in range(self.prefetch_pages):
+            yield self.page_request(start=page * self.page_size)
+
+    def page_request(self, start: int) -> scrapy.Request:
+        return scrapy.Request(
+            url=self.build_url(start=start),
+            callback=self.parse,
+            cb_kwargs={"start": start},
+            priority=-start // self.page_size,
+        )
 
     def parse(self, response: Response, start: int, **kwargs):  # noqa
-        jobs = response.css("li")
+        jobs = response.xpath(_XP_JOBS)
         num_jobs = len(jobs)
 
         if response.status == 400 or not num_jobs:
-            self.logger.info(f"No jobs found -> stopping. (start={start})")
+            self._stopped = True
+            self.logger.info("No jobs found -> stopping. (start=%s)", start)
             return
 
-        self.logger.info(f"Fetching page (start={start})")
+        self.logger.info("Fetching page (start=%s)", start)
         for job in jobs:
-            detail_link = (
-                job.css(".base-card__full-link::attr(href)").get(default="").strip()
-            )
+            detail_link = job.xpath(_XP_DETAIL_LINK).get(default="").strip()
 
             item = JobItem(
-                title=job.css("h3::text").get(default="not-found").strip(),
-                company_name=job.css("h4 a::text").get(default="not-found").strip(),
-                location=job.css(".job-search-card__location::text")
-                .get(default="")
-                .strip(),
-                listed_date=job.css("time::attr(datetime)").get(default="").strip(),
+                title=job.xpath(_XP_TITLE).get(default="not-found").strip(),
+                company_name=job.xpath(_XP_COMPANY).get(default="not-found").strip(),
+                location=job.xpath(_XP_LOCATION).get(default="").strip(),
+                listed_date=job.xpath(_XP_LISTED_DATE).get(default="").strip(),
                 detail_link=detail_link,
                 skills=[],
                 years_of_experience=None,
             )
             if detail_link:
+                key = detail_link.split("?", 1)[0]
+                if key in self._seen:
+                    continue
+                self._seen.add(key)
                 yield response.follow(
                     detail_link, callback=self.parse_skills, cb_kwargs={"item": item}
                 )
 
-        start += 25
-        yield scrapy.Request(
-            url=self.build_url(start=start),
-            callback=self.parse,
-            cb_kwargs={"start": start},
-        )
-
-    async def parse_skills(self, response: Response, item: JobItem):
-        desc_container = response.css("div.show-more-less-html__markup")
-        text_nodes = desc_container.xpath(".//text()").getall()
-        cleaned = [t.strip() for t in text_nodes if t.strip()]
-        job_description = " ".join(cleaned)
-
-        requirements = await extract(job_description)
-        item["skills"] = requirements.get("required_skills", [])
-        item["years_of_experience"] = requirements.get("years_experience", 0)
-        self.logger.info(f"Returning required skills ({requirements})")
+        # Slide the window: each full page schedules the one `prefetch_pages`
+        # ahead. Every offset has exactly one such predecessor, so pages can
+        # arrive in any order without gaps or duplicates. Pages already in
+        # flight past the end just come back empty.
+        next_start = start + self.prefetch_pages * self.page_size
+        if not self._stopped:
+            yield self.page_request(start=next_start)
+
+    def parse_skills(self, response: Response, item: JobItem):
+        desc_container = response.xpath(_XP_DESC)
+        # Space-join the text nodes (string()/normalize-space() would glue
+        # "<p>Python</p><p>Django</p>" into "PythonDjango"), then collapse
+        # whitespace with str.split() instead of stripping node by node.
+        text = " ".join(desc_container.xpath(".//text()").getall())
+
+        # Skills are extracted in batches by SkillBatchPipeline.
+        item.description = " ".join(text.split())
         yield item
 
     # ---- NEW: run after feeds close ----
     def on_feeds_ready(self, *args, **kwargs):
         """
-        Called after feed exporter finished (or after engine stopped if older Scrapy).
-        At this point the CSV should be fully written. We still add a short retry loop
-        in case of filesystem lag.
+        Called once the feed exporter has finished. The exporter fsyncs the
+        file before this signal fires, so it can be read right away.
+
+        pandas/matplotlib work runs in the reactor thread pool; the returned
+        Deferred keeps Scrapy from shutting down until it completes.
         """
-        try:
-            if not self.output_file or not self.output_file.exists():
-                self.logger.warning("No output CSV found — skipping analytics.")
-                return
+        if not self.output_file or not self.output_file.exists():
+            self.logger.warning("No output file found — skipping analytics.")
+            return None
 
-            self.logger.info(
-                f"Running analytics for {self.output_file} -> {self.run_dir}"
-            )
+        self.logger.info(
+            "Running analytics for %s -> %s", self.output_file, self.run_dir
+        )
+        d = deferToThread(
+            make_all_charts,
+            str(self.output_file),
+            out_dir=str(self.run_dir),
+            allow_us_state_guess=False,
+        )
+        d.addCallbacks(self._analytics_done, self._analytics_failed)
+        return d
 
-            attempts = 10
-            delay_s = 0.5
-            for i in range(1, attempts + 1):
-                try:
-                    make_all_charts(
-                        str(self.output_file),
-                        out_dir=str(self.run_dir),
-                        allow_us_state_guess=False,
-                    )
-                    self.logger.info("Analytics complete.")
-                    return
-                except (EmptyDataError, ParserError):
-                    if i == attempts:
-                        raise
-                    self.logger.info(
-                        "CSV not ready to parse yet; retrying (%s/%s)...", i, attempts
-                    )
-                    time.sleep(delay_s)
-
-        except Exception as e:
-            self.logger.exception(f"Analytics failed: {e}")
+    def _analytics_done(self, _):
+        self.logger.info("Analytics complete.")
+
+    def _analytics_failed(self, failure):
+        self.logger.error(
+            "Analytics failed: %s",
+            failure.value,
+            exc_info=(failure.type, failure.value, failure.getTracebackObject()),
+        )